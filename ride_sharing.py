@@ -14,6 +14,7 @@ Design Patterns & Strategies Used:
 
 Features:
 - Driver allocation
+- Batch matching of pending rides
 - Surge pricing based on demand
 - Real-time location tracking
 - Dynamic ETA calculation
@@ -22,8 +23,8 @@ Features:
 """
 
 from abc import ABC, abstractmethod
-from enum import Enum
-from typing import List, Optional, Dict
+from enum import Enum, IntEnum
+from typing import List, Optional, Dict, Tuple, Union
 from datetime import datetime, timedelta
 from dataclasses import dataclass
 from uuid import uuid4
@@ -31,6 +32,38 @@ import math
 import random
 
 
+EARTH_DIAMETER_KM = 2 * 6371
+
+
+class VehicleType(IntEnum):
+    """Int-valued so hot-loop filters compare small ints, not strings"""
+    SEDAN = 0
+    SUV = 1
+    XL = 2
+    BIKE = 3
+
+
+_STR_TO_VTYPE: Dict[str, VehicleType] = {v.name.lower(): v for v in VehicleType}
+
+
+def to_vehicle_type(vehicle_type: Union[VehicleType, int, str]) -> VehicleType:
+    """Accept legacy string names ("Sedan") and raw int codes at the API boundary"""
+    if isinstance(vehicle_type, VehicleType):
+        return vehicle_type
+    valid = ", ".join(v.name.lower() for v in VehicleType)
+    if isinstance(vehicle_type, int) and not isinstance(vehicle_type, bool):
+        try:
+            return VehicleType(vehicle_type)
+        except ValueError:
+            raise ValueError(f"Unknown vehicle type code: {vehicle_type} "
+                             f"(expected 0-{len(VehicleType) - 1} for {valid})") from None
+    if isinstance(vehicle_type, str):
+        vtype = _STR_TO_VTYPE.get(vehicle_type.lower())
+        if vtype is not None:
+            return vtype
+    raise ValueError(f"Unknown vehicle type: {vehicle_type!r} (expected one of: {valid})")
+
+
 class RideState(Enum):
     REQUESTED = "REQUESTED"
     MATCHED = "MATCHED"
@@ -39,34 +72,54 @@ class RideState(Enum):
     CANCELLED = "CANCELLED"
 
 
-@dataclass
+@dataclass(frozen=True)
 class Location:
     latitude: float
     longitude: float
     
+    def __post_init__(self):
+        # Locations are replaced, never mutated, so trig inputs can be cached once
+        lat_rad = math.radians(self.latitude)
+        lon_rad = math.radians(self.longitude)
+        cos_lat = math.cos(lat_rad)
+        object.__setattr__(self, '_lat_rad', lat_rad)
+        object.__setattr__(self, '_lon_rad', lon_rad)
+        object.__setattr__(self, '_cos_lat', cos_lat)
+        # Point on the unit sphere, for trig-free nearest-neighbour ranking
+        object.__setattr__(self, '_xyz', (cos_lat * math.cos(lon_rad),
+                                          cos_lat * math.sin(lon_rad),
+                                          math.sin(lat_rad)))
+    
     def distance_to(self, other: 'Location') -> float:
-        """Calculate distance in km"""
-        R = 6371
-        lat1, lon1 = math.radians(self.latitude), math.radians(self.longitude)
-        lat2, lon2 = math.radians(other.latitude), math.radians(other.longitude)
+        """Calculate distance in km (haversine)"""
+        dlat = other._lat_rad - self._lat_rad
+        dlon = other._lon_rad - self._lon_rad
         
-        dlat = lat2 - lat1
-        dlon = lon2 - lon1
+        a = math.sin(dlat * 0.5)**2 + self._cos_lat * other._cos_lat * math.sin(dlon * 0.5)**2
         
-        a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
-        c = 2 * math.asin(math.sqrt(a))
-        
-        return R * c
+        return EARTH_DIAMETER_KM * math.asin(math.sqrt(a))
+    
+    def chord_sq(self, other: 'Location') -> float:
+        """Squared unit-sphere chord length; monotonic in distance, so fine for ranking"""
+        x1, y1, z1 = self._xyz
+        x2, y2, z2 = other._xyz
+        return (x1 - x2)**2 + (y1 - y2)**2 + (z1 - z2)**2
+    
+    @staticmethod
+    def chord_sq_to_km(chord_sq: float) -> float:
+        """Convert a chord_sq value back to great-circle distance in km"""
+        return EARTH_DIAMETER_KM * math.asin(min(1.0, math.sqrt(chord_sq) * 0.5))
 
 
 class Driver:
     """Driver"""
     
-    def __init__(self, driver_id: str, name: str, location: Location, vehicle_type: str):
+    def __init__(self, driver_id: str, name: str, location: Location,
+                 vehicle_type: Union[VehicleType, str]):
         self.driver_id = driver_id
         self.name = name
         self.location = location
-        self.vehicle_type = vehicle_type
+        self.vehicle_type = to_vehicle_type(vehicle_type)
         self.is_available = True
         self.current_ride: Optional[str] = None
         self.rating = 5.0
@@ -101,21 +154,31 @@ class Ride:
     """Ride with state management"""
     
     def __init__(self, ride_id: str, rider_id: str, pickup: Location, 
-                 dropoff: Location, vehicle_type: str):
+                 dropoff: Location, vehicle_type: Union[VehicleType, str],
+                 surge_multiplier: float = 1.0):
         self.ride_id = ride_id
         self.rider_id = rider_id
         self.pickup = pickup
         self.dropoff = dropoff
-        self.vehicle_type = vehicle_type
+        self.vehicle_type = to_vehicle_type(vehicle_type)
         self.state = RideState.REQUESTED
         self.driver_id: Optional[str] = None
         self.base_fare = 50.0
-        self.surge_multiplier = 1.0
+        self.surge_multiplier = surge_multiplier
         self.total_fare: Optional[float] = None
         self.created_at = datetime.now()
         self.start_time: Optional[datetime] = None
         self.end_time: Optional[datetime] = None
         self.eta_minutes: Optional[int] = None
+        # Status payload kept in sync on each transition so polling doesn't rebuild it
+        self._status_view = {
+            "ride_id": ride_id,
+            "state": self.state.value,
+            "driver_id": None,
+            "eta": None,
+            "surge_multiplier": surge_multiplier,
+            "fare": None
+        }
     
     def calculate_fare(self, distance_km: float, duration_minutes: int) -> float:
         """Calculate ride fare"""
@@ -123,6 +186,7 @@ class Ride:
         time_fare = duration_minutes * 1   # $1 per minute
         total = (self.base_fare + distance_fare + time_fare) * self.surge_multiplier
         self.total_fare = total
+        self._status_view["fare"] = total
         return total
     
     def update_state(self, new_state: RideState):
@@ -137,19 +201,25 @@ class Ride:
         
         if new_state in valid_transitions.get(self.state, []):
             self.state = new_state
+            self._status_view["state"] = new_state.value
             return True
         return False
     
     def assign_driver(self, driver_id: str):
         """Assign driver"""
         self.driver_id = driver_id
+        self._status_view["driver_id"] = driver_id
     
     def calculate_eta(self, driver_location: Location) -> int:
         """Calculate ETA in minutes"""
-        distance = driver_location.distance_to(self.pickup)
+        return self.eta_from_distance(driver_location.distance_to(self.pickup))
+    
+    def eta_from_distance(self, distance_km: float) -> int:
+        """Set ETA from an already known driver-to-pickup distance"""
         # Assume average speed of 30 km/h
-        eta_minutes = int((distance / 30) * 60)
+        eta_minutes = int((distance_km / 30) * 60)
         self.eta_minutes = eta_minutes
+        self._status_view["eta"] = eta_minutes
         return eta_minutes
 
 
@@ -157,54 +227,70 @@ class MatchingStrategy(ABC):
     """Ride matching strategy interface"""
     
     @abstractmethod
-    def match_ride(self, ride: Ride, available_drivers: List[Driver]) -> Optional[Driver]:
+    def match_ride(self, ride: Ride, available_drivers: List[Driver]) -> Optional[Tuple[Driver, float]]:
+        """Return the chosen driver and its distance to pickup in km"""
         pass
 
 
 class NearestDriverStrategy(MatchingStrategy):
     """Match with nearest driver"""
     
-    def match_ride(self, ride: Ride, available_drivers: List[Driver]) -> Optional[Driver]:
-        matching_drivers = [d for d in available_drivers 
-                          if d.is_available and d.vehicle_type == ride.vehicle_type]
+    def match_ride(self, ride: Ride, available_drivers: List[Driver]) -> Optional[Tuple[Driver, float]]:
+        pickup = ride.pickup
+        vehicle_type = ride.vehicle_type
+        best: Optional[Driver] = None
+        best_chord_sq = math.inf
         
-        if not matching_drivers:
-            return None
+        for d in available_drivers:
+            if d.is_available and d.vehicle_type is vehicle_type:
+                chord_sq = pickup.chord_sq(d.location)
+                if chord_sq < best_chord_sq:
+                    best, best_chord_sq = d, chord_sq
         
-        nearest = min(matching_drivers, 
-                     key=lambda d: ride.pickup.distance_to(d.location))
-        return nearest
+        if best is None:
+            return None
+        return best, Location.chord_sq_to_km(best_chord_sq)
 
 
 class LoadBalancingStrategy(MatchingStrategy):
     """Match considering driver load"""
     
-    def match_ride(self, ride: Ride, available_drivers: List[Driver]) -> Optional[Driver]:
-        matching_drivers = [d for d in available_drivers 
-                          if d.is_available and d.vehicle_type == ride.vehicle_type]
-        
-        if not matching_drivers:
-            return None
+    def match_ride(self, ride: Ride, available_drivers: List[Driver]) -> Optional[Tuple[Driver, float]]:
+        pickup = ride.pickup
+        vehicle_type = ride.vehicle_type
+        best: Optional[Driver] = None
+        best_distance = 0.0
+        best_score = math.inf
         
-        # Score based on distance and rating
-        def score(driver: Driver) -> float:
-            distance = ride.pickup.distance_to(driver.location)
-            # Lower distance and higher rating is better
-            return distance - (driver.rating * 2)
+        for d in available_drivers:
+            if d.is_available and d.vehicle_type is vehicle_type:
+                distance = pickup.distance_to(d.location)
+                # Score based on distance and rating; lower distance and higher rating is better
+                score = distance - (d.rating * 2)
+                if score < best_score:
+                    best, best_distance, best_score = d, distance, score
         
-        best = min(matching_drivers, key=score)
-        return best
+        if best is None:
+            return None
+        return best, best_distance
 
 
 class RideSharingService:
     """Main ride sharing service"""
     
-    def __init__(self):
+    def __init__(self, batch_size: int = 8):
         self.rides: Dict[str, Ride] = {}
         self.drivers: Dict[str, Driver] = {}
         self.riders: Dict[str, Rider] = {}
         self.matching_strategy: MatchingStrategy = NearestDriverStrategy()
         self.observers: List = []
+        self._pending: List[Ride] = []
+        # Rides queued since the last flush; requeued leftovers don't count,
+        # so a driverless backlog isn't re-flushed on every new request
+        self._new_pending = 0
+        # COMPLETED/CANCELLED rides have no outgoing transitions; keep them out of the live dict
+        self._archive: Dict[str, Ride] = {}
+        self.batch_size = batch_size
     
     def add_driver(self, driver: Driver):
         """Add driver"""
@@ -219,15 +305,14 @@ class RideSharingService:
         self.matching_strategy = strategy
     
     def request_ride(self, rider_id: str, pickup: Location, dropoff: Location,
-                    vehicle_type: str = "Sedan") -> Optional[str]:
+                    vehicle_type: Union[VehicleType, str] = VehicleType.SEDAN) -> Optional[str]:
         """Request ride"""
         ride_id = str(uuid4())
         
         # Calculate surge pricing
         surge = self._calculate_surge(pickup)
         
-        ride = Ride(ride_id, rider_id, pickup, dropoff, vehicle_type)
-        ride.surge_multiplier = surge
+        ride = Ride(ride_id, rider_id, pickup, dropoff, vehicle_type, surge)
         
         self.rides[ride_id] = ride
         
@@ -236,6 +321,58 @@ class RideSharingService:
         
         return ride_id
     
+    def queue_ride(self, rider_id: str, pickup: Location, dropoff: Location,
+                   vehicle_type: Union[VehicleType, str] = VehicleType.SEDAN) -> str:
+        """Request ride for batch matching (flushed on a dispatcher tick or when batch is full)"""
+        ride_id = str(uuid4())
+        
+        ride = Ride(ride_id, rider_id, pickup, dropoff, vehicle_type,
+                    self._calculate_surge(pickup))
+        
+        self.rides[ride_id] = ride
+        self._pending.append(ride)
+        self._new_pending += 1
+        
+        if self._new_pending >= self.batch_size:
+            self.flush_pending()
+        
+        return ride_id
+    
+    def flush_pending(self) -> int:
+        """Match all pending rides at once, closest ride/driver pairs first"""
+        pending = [r for r in self._pending if r.state == RideState.REQUESTED]
+        self._pending = []
+        self._new_pending = 0
+        if not pending:
+            return 0
+        
+        drivers = [d for d in self.drivers.values() if d.is_available]
+        
+        # Build the ride x driver distance table once instead of one scan per ride
+        pairs = []
+        for i, ride in enumerate(pending):
+            for j, driver in enumerate(drivers):
+                if driver.vehicle_type is ride.vehicle_type:
+                    pairs.append((ride.pickup.chord_sq(driver.location), i, j))
+        pairs.sort()
+        
+        ride_done = [False] * len(pending)
+        driver_taken = [False] * len(drivers)
+        matched = 0
+        for chord_sq, i, j in pairs:
+            if ride_done[i] or driver_taken[j]:
+                continue
+            ride_done[i] = driver_taken[j] = True
+            self._assign(pending[i], drivers[j], Location.chord_sq_to_km(chord_sq))
+            matched += 1
+        
+        if matched < len(pending):
+            # Keep unmatched rides queued so a later flush can still serve them
+            self._pending = [r for done, r in zip(ride_done, pending)
+                             if not done and r.state == RideState.REQUESTED] + self._pending
+            print(f"[Match] No driver available for {len(pending) - matched} ride(s)")
+        return matched
+    
     def _calculate_surge(self, location: Location) -> float:
         """Calculate surge pricing based on demand"""
         # Simulate surge calculation
@@ -247,19 +384,23 @@ class RideSharingService:
     def _match_driver(self, ride: Ride):
         """Match driver to ride"""
         available_drivers = list(self.drivers.values())
-        driver = self.matching_strategy.match_ride(ride, available_drivers)
+        match = self.matching_strategy.match_ride(ride, available_drivers)
         
-        if driver:
-            ride.assign_driver(driver.driver_id)
-            ride.update_state(RideState.MATCHED)
-            driver.start_ride(ride.ride_id)
-            
-            # Calculate ETA
-            eta = ride.calculate_eta(driver.location)
-            print(f"[Match] Driver {driver.driver_id} matched. ETA: {eta} minutes")
+        if match:
+            self._assign(ride, *match)
         else:
             print("[Match] No driver available")
     
+    def _assign(self, ride: Ride, driver: Driver, distance_km: float):
+        """Bind driver to ride"""
+        ride.assign_driver(driver.driver_id)
+        ride.update_state(RideState.MATCHED)
+        driver.start_ride(ride.ride_id)
+        
+        # ETA from the distance the matcher already computed
+        eta = ride.eta_from_distance(distance_km)
+        print(f"[Match] Driver {driver.driver_id} matched. ETA: {eta} minutes")
+    
     def start_ride(self, ride_id: str):
         """Start ride"""
         if ride_id not in self.rides:
@@ -293,6 +434,7 @@ class RideSharingService:
         if ride.driver_id and ride.driver_id in self.drivers:
             self.drivers[ride.driver_id].complete_ride()
         
+        self._archive[ride_id] = self.rides.pop(ride_id)
         return fare
     
     def cancel_ride(self, ride_id: str, cancelled_by: str):
@@ -311,6 +453,7 @@ class RideSharingService:
         if ride.driver_id and ride.driver_id in self.drivers:
             self.drivers[ride.driver_id].complete_ride()
         
+        self._archive[ride_id] = self.rides.pop(ride_id)
         print(f"[Cancel] Ride {ride_id} cancelled by {cancelled_by}")
         return True
     
@@ -325,19 +468,14 @@ class RideSharingService:
                     ride.calculate_eta(location)
     
     def get_ride_status(self, ride_id: str) -> Optional[Dict]:
-        """Get ride status"""
-        if ride_id not in self.rides:
-            return None
+        """Get ride status (live view; treat as read-only, copy before mutating)"""
+        ride = self.rides.get(ride_id)
+        if ride is None:
+            ride = self._archive.get(ride_id)
+            if ride is None:
+                return None
         
-        ride = self.rides[ride_id]
-        return {
-            "ride_id": ride_id,
-            "state": ride.state.value,
-            "driver_id": ride.driver_id,
-            "eta": ride.eta_minutes,
-            "surge_multiplier": ride.surge_multiplier,
-            "fare": ride.total_fare
-        }
+        return ride._status_view
 
 
 # ==================== DEMONSTRATION ====================
@@ -381,6 +519,8 @@ def main():
     print("4. Completing ride:")
     fare = service.complete_ride(ride_id)
     print(f"Fare: ${fare:.2f}")
+    status = service.get_ride_status(ride_id)
+    print(f"Status: {status}")
     print()
     
     print("5. Testing load balancing strategy:")
@@ -389,6 +529,15 @@ def main():
     print(f"Ride with load balancing: {ride_id2}")
     print()
     
+    print("6. Batch matching pending rides:")
+    service.add_driver(Driver("D3", "Bob", Location(28.6210, 77.2210), "Sedan"))
+    service.add_driver(Driver("D4", "Eve", Location(28.6000, 77.2000), "Sedan"))
+    service.queue_ride("R1", Location(28.6010, 77.2010), dropoff)
+    service.queue_ride("R1", pickup, dropoff)
+    matched = service.flush_pending()
+    print(f"Matched {matched} pending rides")
+    print()
+    
     print("=" * 60)
     print("DESIGN PATTERNS & STRATEGIES:")
     print("=" * 60)
@@ -404,6 +553,7 @@ def main():
     print("- Real-time location tracking")
     print("- Dynamic ETA calculation")
     print("- Cancellation handling")
+    print("- Batch matching of pending rides")
     print("=" * 60)
 
 
@@ -2,22 +2,46 @@ import threading
 
 class Singleton:
     _instance = None
-    _lock = threading.Lock()
+    _lock = threading.RLock()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # One lock per class, so a singleton whose __init__ pulls in another
+        # singleton's instance() doesn't block on a shared lock
+        cls._lock = threading.RLock()
+
+    def __new__(cls, *args, **kwargs):
+        # Look only at cls's own namespace so each subclass gets its own instance
+        inst = cls.__dict__.get('_instance')
+        if inst is not None:
+            return inst
+        with cls._lock:
+            inst = cls.__dict__.get('_instance')
+            if inst is None:
+                # Initialize before publishing, so no thread can see a
+                # half-built instance through the unlocked fast path
+                inst = object.__new__(cls)
+                inst.__init__(*args, **kwargs)
+                cls._instance = inst
+        return inst
 
     @classmethod
     def instance(cls, *args, **kwargs):
-        print("instance called")
-        if cls._instance is None:
-            with cls._lock:
-                if cls._instance is None:
-                    cls._instance = cls(*args, **kwargs)
-        return cls._instance
+        # Fast path: skip the __new__/__init__ round-trip once created
+        inst = cls.__dict__.get('_instance')
+        if inst is not None:
+            return inst
+        return cls(*args, **kwargs)
 
 
 class Logger(Singleton):
     def __init__(self, name: str):
+        # __init__ runs on every cls() call; only the first one initializes
+        if getattr(self, '_did_init', False):
+            return
         print(f"Initializing Logger with name: {name}")
         self.name = name
+        self._did_init = True
 
 
 # Correct usage
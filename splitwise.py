@@ -21,11 +21,13 @@ Data Structures:
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
 from dataclasses import dataclass
 from collections import defaultdict
+from itertools import repeat
 from uuid import uuid4
 from enum import Enum
+import sys
 
 
 class SettlementStrategy(Enum):
@@ -39,33 +41,99 @@ class Expense:
     """Expense data structure"""
     expense_id: str
     paid_by: str
-    amount: float
+    amount: int  # cents
     split_between: List[str]
     split_type: str  # EQUAL, EXACT, PERCENTAGE
     description: str
     created_at: str
 
 
+def _to_cents(amount: float) -> int:
+    """Convert a currency amount to integer cents"""
+    return int(round(amount * 100))
+
+
+def _from_cents(cents: int) -> float:
+    """Convert integer cents back to a currency amount"""
+    return cents / 100
+
+
+def _settle_core(net: List[int]) -> List[Tuple[int, int, int]]:
+    """Greedy two-pointer settlement over net amounts (cents) indexed by position.
+    
+    Returns (debtor_idx, creditor_idx, amount) triples. Works on plain
+    indices and ints so the loop does no tuple rebuilding or id lookups,
+    and balances reach exactly zero without an epsilon.
+    """
+    remaining = list(net)
+    creditors = sorted((i for i, amt in enumerate(remaining) if amt < 0),
+                       key=remaining.__getitem__)  # Most negative first
+    debtors = sorted((i for i, amt in enumerate(remaining) if amt > 0),
+                     key=remaining.__getitem__, reverse=True)  # Most positive first
+    
+    settlements = []
+    c_idx, d_idx = 0, 0
+    n_creditors, n_debtors = len(creditors), len(debtors)
+    
+    while c_idx < n_creditors and d_idx < n_debtors:
+        c = creditors[c_idx]
+        d = debtors[d_idx]
+        creditor_amount = remaining[c]
+        debtor_amount = remaining[d]
+        
+        settle_amount = min(-creditor_amount, debtor_amount)
+        settlements.append((d, c, settle_amount))
+        
+        creditor_amount += settle_amount
+        debtor_amount -= settle_amount
+        remaining[c] = creditor_amount
+        remaining[d] = debtor_amount
+        
+        if creditor_amount == 0:
+            c_idx += 1
+        if debtor_amount == 0:
+            d_idx += 1
+    
+    return settlements
+
+
+# Equal-split updates for small groups run through straight-line functions
+# generated once per group size, avoiding the generic per-share loop.
+_MAX_SPECIALIZED_GROUP = 8
+_update_specializations: Dict[int, Callable] = {}
+
+
+def _specialized_update(n: int) -> Callable:
+    """Get (building on first use) the balance update for n debtors of one payer"""
+    fn = _update_specializations.get(n)
+    if fn is None:
+        args = ", ".join(f"u{i}" for i in range(n))
+        lines = [f"def _upd_{n}(net, users, paid_by, share, {args}):"]
+        for i in range(n):
+            lines.append(f"    net[u{i}] += share")
+            lines.append(f"    users[u{i}].balances[paid_by] += share")
+        lines.append(f"    net[paid_by] -= {n} * share")
+        namespace: Dict[str, Callable] = {}
+        exec("\n".join(lines), namespace)
+        fn = _update_specializations[n] = namespace[f"_upd_{n}"]
+    return fn
+
+
 class User:
     """User in the system"""
     
     def __init__(self, user_id: str, name: str):
         self.user_id = user_id
         self.name = name
-        self.balances: Dict[str, float] = {}  # user_id -> amount owed
+        self.balances: Dict[str, int] = defaultdict(int)  # user_id -> cents owed
     
     def add_balance(self, user_id: str, amount: float):
         """Add balance with another user"""
-        if user_id not in self.balances:
-            self.balances[user_id] = 0.0
-        self.balances[user_id] += amount
+        self.balances[user_id] += _to_cents(amount)
     
     def get_total_balance(self) -> float:
         """Get net balance (positive = owes, negative = owed)"""
-        total = 0.0
-        for amount in self.balances.values():
-            total += amount
-        return total
+        return _from_cents(sum(self.balances.values()))
 
 
 class ExpenseSharingService:
@@ -74,7 +142,9 @@ class ExpenseSharingService:
     def __init__(self):
         self.users: Dict[str, User] = {}
         self.expenses: List[Expense] = []
-        self.net_balances: Dict[str, float] = {}  # user_id -> net balance
+        self.net_balances: Dict[str, int] = defaultdict(int)  # user_id -> net balance (cents)
+        # Settlement plan (cents) for the current balances; cleared whenever they change
+        self._settlement_cache: Optional[List[Tuple[str, str, int]]] = None
     
     def add_user(self, user_id: str, name: str):
         """Add user"""
@@ -83,13 +153,71 @@ class ExpenseSharingService:
     def add_expense(self, paid_by: str, amount: float, split_between: List[str],
                    split_type: str = "EQUAL", description: str = ""):
         """Add expense"""
-        expense_id = str(uuid4())
+        amount = _to_cents(amount)
         
         # Calculate splits
-        splits = self._calculate_splits(amount, split_between, split_type)
+        splits = self._calculate_splits(amount, split_between, split_type, paid_by)
+        
+        expense = self._record_expense(paid_by, amount, split_between, split_type, description)
+        
+        # Update balances
+        self._update_balances(expense, splits)
+        
+        return expense
+    
+    def add_expenses_bulk(self, records: Iterable[tuple]) -> List[Expense]:
+        """Import many expenses at once, all or nothing
         
+        Each record is (paid_by, amount, split_between[, split_type[, description]]).
+        Splits are folded into per-user and per-pair deltas first; only once
+        every record has been validated are the expenses recorded and the
+        deltas applied to the balances in one pass. A bad record raises
+        before anything changes.
+        """
+        net_delta: Dict[str, int] = defaultdict(int)
+        pair_delta: Dict[Tuple[str, str], int] = defaultdict(int)
+        pending = []
+        
+        for paid_by, amount, split_between, *rest in records:
+            split_type = rest[0] if rest else "EQUAL"
+            description = rest[1] if len(rest) > 1 else ""
+            
+            amount = _to_cents(amount)
+            splits = self._calculate_splits(amount, split_between, split_type, paid_by)
+            if isinstance(splits, tuple):
+                share, participants = splits
+                shares = zip(participants, repeat(share))
+            else:
+                shares = splits.items()
+            owed = 0
+            for user_id, share in shares:
+                if user_id != paid_by:
+                    pair_delta[user_id, paid_by] += share
+                    net_delta[user_id] += share
+                    owed += share
+            net_delta[paid_by] -= owed
+            
+            pending.append((paid_by, amount, split_between, split_type, description))
+        
+        # Everything validated: record expenses and apply accumulated deltas
+        added = [self._record_expense(*record) for record in pending]
+        users = self.users
+        net_balances = self.net_balances
+        for user_id, delta in net_delta.items():
+            if user_id not in users:
+                self.add_user(user_id, user_id)
+            net_balances[user_id] += delta
+        for (user_id, paid_by), delta in pair_delta.items():
+            users[user_id].balances[paid_by] += delta
+        self._settlement_cache = None
+        
+        return added
+    
+    def _record_expense(self, paid_by: str, amount: int, split_between: List[str],
+                        split_type: str, description: str) -> Expense:
+        """Create and store expense record (amount in cents)"""
         expense = Expense(
-            expense_id=expense_id,
+            expense_id=str(uuid4()),
             paid_by=paid_by,
             amount=amount,
             split_between=split_between,
@@ -99,41 +227,70 @@ class ExpenseSharingService:
         )
         
         self.expenses.append(expense)
-        
-        # Update balances
-        self._update_balances(expense, splits)
-        
         return expense
     
-    def _calculate_splits(self, amount: float, split_between: List[str],
-                         split_type: str) -> Dict[str, float]:
-        """Calculate split amounts"""
+    def _calculate_splits(self, amount: int, split_between: List[str],
+                         split_type: str, paid_by: Optional[str] = None
+                         ) -> Union[Tuple[int, List[str]], Dict[str, int]]:
+        """Calculate split amounts in cents; shares always sum to amount
+        
+        EQUAL shares differ by at most one cent: the leftover cents go one
+        each to the payer (if splitting) and then to participants in listed
+        order. When that leaves every debtor with the same share, returns
+        (per_person, participants); otherwise a user_id -> share dict.
+        Other split types return a user_id -> share dict.
+        """
         if split_type == "EQUAL":
-            per_person = amount / len(split_between)
-            return {user_id: per_person for user_id in split_between}
+            # A user listed twice still owes one share
+            participants = list(dict.fromkeys(split_between))
+            share, rem = divmod(amount, len(participants))
+            payer_splits = paid_by in participants
+            if rem == 0 or (rem == 1 and payer_splits):
+                return share, participants
+            order = participants
+            if payer_splits:
+                order = [paid_by] + [u for u in participants if u != paid_by]
+            return {user_id: share + (i < rem) for i, user_id in enumerate(order)}
         # Add more split types as needed
         return {}
     
-    def _update_balances(self, expense: Expense, splits: Dict[str, float]):
+    def _update_balances(self, expense: Expense,
+                         splits: Union[Tuple[int, List[str]], Dict[str, int]]):
         """Update balances between users"""
         paid_by = expense.paid_by
+        self._settlement_cache = None
+        
+        if paid_by not in self.users:
+            self.add_user(paid_by, paid_by)
+        users = self.users
+        net_balances = self.net_balances
+        
+        if isinstance(splits, tuple):
+            per_person, participants = splits
+            debtors = [user_id for user_id in participants if user_id != paid_by]
+            if len(debtors) <= _MAX_SPECIALIZED_GROUP:
+                for user_id in debtors:
+                    if user_id not in users:
+                        self.add_user(user_id, user_id)
+                if debtors:
+                    _specialized_update(len(debtors))(net_balances, users, paid_by,
+                                                      per_person, *debtors)
+                return
+            shares = zip(debtors, repeat(per_person))
+        else:
+            shares = splits.items()
         
-        for user_id, share in splits.items():
+        for user_id, share in shares:
             if user_id != paid_by:
                 # User owes money to paid_by
-                if user_id not in self.users:
+                if user_id not in users:
                     self.add_user(user_id, user_id)
                 
-                self.users[user_id].add_balance(paid_by, share)
+                users[user_id].balances[paid_by] += share
                 
                 # Update net balances
-                if user_id not in self.net_balances:
-                    self.net_balances[user_id] = 0.0
-                if paid_by not in self.net_balances:
-                    self.net_balances[paid_by] = 0.0
-                
-                self.net_balances[user_id] += share
-                self.net_balances[paid_by] -= share
+                net_balances[user_id] += share
+                net_balances[paid_by] -= share
     
     def get_user_balance(self, user_id: str) -> Dict[str, float]:
         """Get balance details for user"""
@@ -141,51 +298,33 @@ class ExpenseSharingService:
             return {}
         
         user = self.users[user_id]
-        return user.balances.copy()
+        return {other: _from_cents(cents) for other, cents in user.balances.items()}
     
     def get_all_balances(self) -> Dict[str, Dict[str, float]]:
         """Get all balances"""
-        return {user_id: user.balances for user_id, user in self.users.items()}
+        return {user_id: self.get_user_balance(user_id) for user_id in self.users}
+    
+    def get_net_balance(self, user_id: str) -> float:
+        """Get net balance for user (positive = owes, negative = gets back)"""
+        return _from_cents(self.net_balances.get(user_id, 0))
     
     def settle_up_minimize_transactions(self) -> List[Tuple[str, str, float]]:
         """Settle up with minimum transactions (Graph algorithm)"""
-        # Get net balances
-        net = {user_id: self.net_balances.get(user_id, 0.0) 
-               for user_id in self.users.keys()}
-        
-        # Separate creditors and debtors
-        creditors = [(uid, amount) for uid, amount in net.items() if amount < 0]
-        debtors = [(uid, amount) for uid, amount in net.items() if amount > 0]
-        
-        creditors.sort(key=lambda x: x[1])  # Most negative first
-        debtors.sort(key=lambda x: x[1], reverse=True)  # Most positive first
-        
-        settlements = []
-        c_idx, d_idx = 0, 0
-        
-        while c_idx < len(creditors) and d_idx < len(debtors):
-            creditor_id, creditor_amount = creditors[c_idx]
-            debtor_id, debtor_amount = debtors[d_idx]
-            
-            # Calculate settlement
-            settle_amount = min(abs(creditor_amount), debtor_amount)
+        if self._settlement_cache is None:
+            # Map user ids with a non-zero net balance to contiguous indices
+            # for the numeric core, then back
+            user_ids = []
+            amounts = []
+            for user_id, amount in self.net_balances.items():
+                if amount:
+                    user_ids.append(user_id)
+                    amounts.append(amount)
             
-            settlements.append((debtor_id, creditor_id, settle_amount))
-            
-            creditor_amount += settle_amount
-            debtor_amount -= settle_amount
-            
-            if abs(creditor_amount) < 0.01:
-                c_idx += 1
-            else:
-                creditors[c_idx] = (creditor_id, creditor_amount)
-            
-            if debtor_amount < 0.01:
-                d_idx += 1
-            else:
-                debtors[d_idx] = (debtor_id, debtor_amount)
+            self._settlement_cache = [(user_ids[d], user_ids[c], amount)
+                                      for d, c, amount in _settle_core(amounts)]
         
-        return settlements
+        return [(debtor, creditor, _from_cents(amount))
+                for debtor, creditor, amount in self._settlement_cache]
     
     def settle_up_minimize_cash_flow(self) -> List[Tuple[str, str, float]]:
         """Settle up with minimum cash flow (Greedy algorithm)"""
@@ -201,9 +340,17 @@ class ExpenseSharingService:
         else:
             settlements = self.settle_up_minimize_transactions()
         
-        # Apply settlements
+        self.apply_settlements(settlements)
+        if settlements:
+            sys.stdout.write(self.format_settlements(settlements) + "\n")
+        
+        return settlements
+    
+    def apply_settlements(self, settlements: List[Tuple[str, str, float]]) -> List[Tuple[str, str, float]]:
+        """Apply settlement payments to balances (no output)"""
+        self._settlement_cache = None
         for debtor, creditor, amount in settlements:
-            print(f"{debtor} pays {creditor} ${amount:.2f}")
+            amount = _to_cents(amount)
             
             # Update balances
             if debtor in self.users and creditor in self.users:
@@ -217,6 +364,12 @@ class ExpenseSharingService:
                 self.net_balances[creditor] = min(0, self.net_balances[creditor] + amount)
         
         return settlements
+    
+    @staticmethod
+    def format_settlements(settlements: List[Tuple[str, str, float]]) -> str:
+        """Render settlements as one line per payment"""
+        return "\n".join(f"{debtor} pays {creditor} ${amount:.2f}"
+                         for debtor, creditor, amount in settlements)
 
 
 # ==================== DEMONSTRATION ====================
@@ -236,9 +389,9 @@ def main():
     service.add_user("D", "David")
     
     print("1. Adding expenses:")
-    service.add_expense("A", 100.0, ["A", "B", "C"], "Dinner")
-    service.add_expense("B", 50.0, ["B", "C", "D"], "Uber")
-    service.add_expense("C", 60.0, ["A", "C", "D"], "Movie")
+    service.add_expense("A", 100.0, ["A", "B", "C"], description="Dinner")
+    service.add_expense("B", 50.0, ["B", "C", "D"], description="Uber")
+    service.add_expense("C", 60.0, ["A", "C", "D"], description="Movie")
     print("Expenses added")
     print()
     
@@ -252,7 +405,7 @@ def main():
     
     print("3. Net balances:")
     for user_id in ["A", "B", "C", "D"]:
-        net = service.net_balances.get(user_id, 0.0)
+        net = service.get_net_balance(user_id)
         status = "owes" if net > 0 else "gets back" if net < 0 else "settled"
         print(f"User {user_id}: ${abs(net):.2f} ({status})")
     print()
@@ -262,6 +415,17 @@ def main():
     print(f"Total transactions: {len(settlements)}")
     print()
     
+    print("5. Bulk import:")
+    service.add_expenses_bulk([
+        ("A", 40.0, ["A", "B"], "EQUAL", "Groceries"),
+        ("D", 90.0, ["B", "C", "D"], "EQUAL", "Tickets"),
+    ])
+    for user_id in ["A", "B", "C", "D"]:
+        net = service.get_net_balance(user_id)
+        status = "owes" if net > 0 else "gets back" if net < 0 else "settled"
+        print(f"User {user_id}: ${abs(net):.2f} ({status})")
+    print()
+    
     print("=" * 60)
     print("DESIGN PATTERNS & STRATEGIES:")
     print("=" * 60)
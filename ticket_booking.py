@@ -26,18 +26,28 @@ Seat Locking Strategy:
 
 from abc import ABC, abstractmethod
 from enum import Enum
-from typing import List, Optional, Dict, Set
+from typing import List, Optional, Dict, Set, Tuple, Callable
 from datetime import datetime, timedelta
 from threading import Lock
 from dataclasses import dataclass
 from uuid import uuid4
+from collections import defaultdict
+from itertools import compress
+import functools
+import heapq
+import time
 
 
 class SeatState(Enum):
-    AVAILABLE = "AVAILABLE"
-    LOCKED = "LOCKED"
-    RESERVED = "RESERVED"
-    OCCUPIED = "OCCUPIED"
+    # Small ints so each Show can mirror seat states in a byte array
+    AVAILABLE = 0
+    LOCKED = 1
+    RESERVED = 2
+    OCCUPIED = 3
+
+
+# bytes.translate table: AVAILABLE -> 1, every other state -> 0
+_IS_AVAILABLE = bytes([1] + [0] * 255)
 
 
 class PaymentStatus(Enum):
@@ -54,6 +64,14 @@ class PaymentStatus(Enum):
 class Seat:
     """Seat with State Pattern"""
     
+    # Fixed attribute layout: no per-seat __dict__, slot reads are C-level offsets
+    __slots__ = ('seat_id', 'row', 'number', 'seat_type', 'state', 'locked_by',
+                 'locked_until', 'version', '_show', '_idx')
+    
+    # Seats share a small pool of striped locks instead of owning a mutex each
+    _N_STRIPES = 64
+    _STRIPES = [Lock() for _ in range(_N_STRIPES)]
+    
     def __init__(self, seat_id: str, row: str, number: int, seat_type: str):
         self.seat_id = seat_id
         self.row = row
@@ -61,52 +79,77 @@ class Seat:
         self.seat_type = seat_type
         self.state = SeatState.AVAILABLE
         self.locked_by: Optional[str] = None
-        self.locked_until: Optional[datetime] = None
+        self.locked_until: float = 0.0  # time.monotonic() deadline
         self.version = 0  # For optimistic locking
-        self.lock = Lock()
+        self._show: Optional['Show'] = None  # Set by Show.add_seat
+        self._idx = -1
+    
+    def _lk(self) -> Lock:
+        """Stripe lock guarding this seat"""
+        return Seat._STRIPES[hash(self.seat_id) & (Seat._N_STRIPES - 1)]
+    
+    def _set_state(self, new_state: SeatState):
+        """Change state and keep the owning show's state mirror in sync"""
+        self.state = new_state
+        if self._show is not None:
+            self._show._states[self._idx] = new_state.value
+    
+    # The transition methods pre-check state without the lock: reading one
+    # attribute reference is atomic under CPython's GIL, and a stale "looks
+    # possible" read is re-verified inside the critical section. This keeps
+    # the common failing case (seat already taken) from touching the lock.
     
     def lock_seat(self, user_id: str, timeout_minutes: int = 5) -> bool:
         """Lock seat for booking with timeout"""
-        with self.lock:
-            if self.state == SeatState.AVAILABLE:
-                self.state = SeatState.LOCKED
-                self.locked_by = user_id
-                self.locked_until = datetime.now() + timedelta(minutes=timeout_minutes)
-                self.version += 1
-                return True
+        if self.state != SeatState.AVAILABLE:
             return False
+        with self._lk():
+            if self.state != SeatState.AVAILABLE:
+                return False
+            self._set_state(SeatState.LOCKED)
+            self.locked_by = user_id
+            self.locked_until = deadline = time.monotonic() + timeout_minutes * 60
+            self.version += 1
+            version = self.version
+        # Every lock path reports its deadline so the expiry sweep can find it
+        show = self._show
+        if show is not None and show.on_seat_locked is not None:
+            show.on_seat_locked(show.show_id, self.seat_id, deadline, version)
+        return True
     
     def reserve_seat(self, user_id: str) -> bool:
         """Reserve seat after payment"""
-        with self.lock:
+        if self.state != SeatState.LOCKED:
+            return False
+        with self._lk():
             if self.state == SeatState.LOCKED and self.locked_by == user_id:
-                self.state = SeatState.RESERVED
+                self._set_state(SeatState.RESERVED)
                 self.version += 1
                 return True
             return False
     
     def release_lock(self) -> bool:
         """Release lock if expired or cancelled"""
-        with self.lock:
+        if self.state != SeatState.LOCKED:
+            return False
+        with self._lk():
             if self.state == SeatState.LOCKED:
-                self.state = SeatState.AVAILABLE
+                self._set_state(SeatState.AVAILABLE)
                 self.locked_by = None
-                self.locked_until = None
+                self.locked_until = 0.0
                 self.version += 1
                 return True
             return False
     
     def is_locked_expired(self) -> bool:
         """Check if lock has expired"""
-        if self.state == SeatState.LOCKED and self.locked_until:
-            return datetime.now() > self.locked_until
-        return False
+        return self.state == SeatState.LOCKED and time.monotonic() > self.locked_until
     
     def occupy_seat(self):
         """Mark seat as occupied (show has started)"""
-        with self.lock:
+        with self._lk():
             if self.state == SeatState.RESERVED:
-                self.state = SeatState.OCCUPIED
+                self._set_state(SeatState.OCCUPIED)
                 self.version += 1
 
 
@@ -116,6 +159,11 @@ class Seat:
 class BookingObserver(ABC):
     """Observer interface"""
     
+    @abstractmethod
+    def subscribed_events(self) -> Set[str]:
+        """Event types this observer wants to receive"""
+        pass
+    
     @abstractmethod
     def update(self, event_type: str, booking_id: str, message: str):
         pass
@@ -124,17 +172,21 @@ class BookingObserver(ABC):
 class EmailNotifier(BookingObserver):
     """Email notification observer"""
     
+    def subscribed_events(self) -> Set[str]:
+        return {"BOOKING_CONFIRMED", "PAYMENT_FAILED", "BOOKING_CANCELLED"}
+    
     def update(self, event_type: str, booking_id: str, message: str):
-        if event_type in ["BOOKING_CONFIRMED", "PAYMENT_FAILED", "BOOKING_CANCELLED"]:
-            print(f"[Email] Booking {booking_id}: {message}")
+        print(f"[Email] Booking {booking_id}: {message}")
 
 
 class SMSNotifier(BookingObserver):
     """SMS notification observer"""
     
+    def subscribed_events(self) -> Set[str]:
+        return {"BOOKING_CONFIRMED", "SEAT_LOCKED"}
+    
     def update(self, event_type: str, booking_id: str, message: str):
-        if event_type in ["BOOKING_CONFIRMED", "SEAT_LOCKED"]:
-            print(f"[SMS] Booking {booking_id}: {message}")
+        print(f"[SMS] Booking {booking_id}: {message}")
 
 
 class BookingNotifier:
@@ -142,12 +194,16 @@ class BookingNotifier:
     
     def __init__(self):
         self.observers: List[BookingObserver] = []
+        # Observers indexed by event type so notify only visits subscribers
+        self._by_event: Dict[str, List[BookingObserver]] = defaultdict(list)
     
     def attach(self, observer: BookingObserver):
         self.observers.append(observer)
+        for event_type in observer.subscribed_events():
+            self._by_event[event_type].append(observer)
     
     def notify(self, event_type: str, booking_id: str, message: str):
-        for observer in self.observers:
+        for observer in self._by_event.get(event_type, ()):
             observer.update(event_type, booking_id, message)
 
 
@@ -265,10 +321,14 @@ class BookingService:
         self.notifier.attach(EmailNotifier())
         self.notifier.attach(SMSNotifier())
         self.lock = Lock()
+        # (locked_until, show_id, seat_id, version) for every lock taken
+        self._expiry_heap: List[tuple] = []
+        self._expiry_lock = Lock()
     
     def add_show(self, show: 'Show'):
         """Add a show"""
         self.shows[show.show_id] = show
+        show.on_seat_locked = self._schedule_expiry
     
     def create_booking(self, user_id: str, show_id: str, 
                       seat_ids: List[str], payment_strategy: PaymentStrategy) -> Optional[Booking]:
@@ -291,7 +351,7 @@ class BookingService:
                 locked_seats.append(seat)
             
             # Step 2: Calculate total amount
-            total_amount = sum(show.get_seat_price(sid) for sid in seat_ids)
+            total_amount = show.get_bundle_price(seat_ids)
             
             # Step 3: Create booking
             booking_id = str(uuid4())
@@ -333,6 +393,11 @@ class BookingService:
                 seat.release_lock()
             return None
     
+    def _schedule_expiry(self, show_id: str, seat_id: str, locked_until: float, version: int):
+        """Seat lock hook: queue the lock for the expiry sweep"""
+        with self._expiry_lock:
+            heapq.heappush(self._expiry_heap, (locked_until, show_id, seat_id, version))
+    
     def cancel_booking(self, booking_id: str) -> bool:
         """Cancel booking and process refund"""
         if booking_id not in self.bookings:
@@ -362,9 +427,18 @@ class BookingService:
     
     def release_expired_locks(self):
         """Background task to release expired locks"""
-        for show in self.shows.values():
-            for seat in show.seats:
-                if seat.is_locked_expired():
+        # Only pop locks whose deadline has passed instead of scanning every seat
+        now = time.monotonic()
+        with self._expiry_lock:
+            heap = self._expiry_heap
+            while heap and heap[0][0] <= now:
+                _, show_id, seat_id, version = heapq.heappop(heap)
+                show = self.shows.get(show_id)
+                if show is None:
+                    continue
+                seat = show.get_seat(seat_id)
+                # A version change means the seat moved on since this lock (stale entry)
+                if seat and seat.version == version:
                     seat.release_lock()
 
 
@@ -377,28 +451,52 @@ class Show:
         self.movie_name = movie_name
         self.theater_id = theater_id
         self.show_time = show_time
-        self.seats: List[Seat] = []
+        self.seats: List[Seat] = []  # Keeps seat order for iteration
+        self.seats_by_id: Dict[str, Seat] = {}
         self.seat_prices: Dict[str, float] = {}
+        self._states = bytearray()  # SeatState values, parallel to self.seats
+        # Seat-lock hook (show_id, seat_id, locked_until, version); set by BookingService.add_show
+        self.on_seat_locked: Optional[Callable[[str, str, float, int], None]] = None
+        # Per-show memo of bundle totals; popular bundles get re-priced constantly
+        self._bundle_price = functools.lru_cache(maxsize=8192)(self._compute_bundle_price)
     
     def add_seat(self, seat: Seat, price: float):
         """Add seat to show"""
+        seat._show = self
+        seat._idx = len(self.seats)
+        self._states.append(seat.state.value)
         self.seats.append(seat)
+        self.seats_by_id[seat.seat_id] = seat
         self.seat_prices[seat.seat_id] = price
+        self._bundle_price.cache_clear()
     
     def get_seat(self, seat_id: str) -> Optional[Seat]:
         """Get seat by ID"""
-        for seat in self.seats:
-            if seat.seat_id == seat_id:
-                return seat
-        return None
+        return self.seats_by_id.get(seat_id)
     
     def get_seat_price(self, seat_id: str) -> float:
         """Get seat price"""
         return self.seat_prices.get(seat_id, 0.0)
     
+    def get_bundle_price(self, seat_ids: List[str]) -> float:
+        """Get total price for a set of seats"""
+        return self._bundle_price(tuple(sorted(seat_ids)))
+    
+    def _compute_bundle_price(self, seat_ids: Tuple[str, ...]) -> float:
+        return sum(self.seat_prices.get(sid, 0.0) for sid in seat_ids)
+    
     def get_available_seats(self) -> List[Seat]:
         """Get all available seats"""
-        return [seat for seat in self.seats if seat.state == SeatState.AVAILABLE]
+        # Byte-wise scan of the state mirror instead of touching every Seat
+        return list(compress(self.seats, self._states.translate(_IS_AVAILABLE)))
+    
+    def count_by_state(self, state: SeatState) -> int:
+        """Number of seats in given state (byte count over the state mirror)"""
+        return self._states.count(state.value)
+    
+    def get_available_count(self) -> int:
+        """Number of available seats"""
+        return self.count_by_state(SeatState.AVAILABLE)
 
 
 # ==================== DEMONSTRATION ====================
@@ -442,7 +540,8 @@ def main():
     # Check available seats
     print("3. Available seats after booking:")
     available = show.get_available_seats()
-    print(f"Available: {[s.seat_id for s in available]}")
+    print(f"Available: {[s.seat_id for s in available]} ({show.get_available_count()} seats)")
+    print(f"Reserved: {show.count_by_state(SeatState.RESERVED)} seats")
     print()
     
     # Cancel booking
@@ -466,7 +565,7 @@ def main():
     print("6. Lock Pattern - Seat locking with timeout")
     print()
     print("RACE CONDITION HANDLING:")
-    print("- Per-seat locks for concurrent access")
+    print("- Striped seat locks for concurrent access")
     print("- Optimistic locking with version numbers")
     print("- Atomic lock-then-reserve operation")
     print("- Rollback on failure")
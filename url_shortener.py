@@ -25,16 +25,21 @@ Scaling:
 """
 
 from abc import ABC, abstractmethod
-from typing import Optional, Dict
+from typing import Optional, Dict, List
+from collections import defaultdict
 import hashlib
-import random
+import os
 import string
-from collections import OrderedDict
+import itertools
+import threading
+import time
 
 
 class EncodingStrategy(ABC):
     """Encoding strategy interface"""
     
+    __slots__ = ()
+    
     @abstractmethod
     def encode(self, url_id: int) -> str:
         """Encode URL ID to short code"""
@@ -46,52 +51,92 @@ class EncodingStrategy(ABC):
         pass
 
 
+_B62_ALPHABET = string.ascii_letters + string.digits  # 62 characters
+# Two digits per step: _B62_PAIRS[i] is the 2-char code for i in [0, 62*62)
+_B62_PAIRS = [a + b for a, b in itertools.product(_B62_ALPHABET, repeat=2)]
+_B62_BASE2 = 62 * 62
+
+
+def _b62_encode(url_id: int) -> str:
+    """Encode number to base-62"""
+    if url_id < 62:
+        if url_id < 0:
+            raise ValueError(f"url_id {url_id} is negative")
+        return _B62_ALPHABET[url_id]
+    
+    # Two-char str pieces joined once beat filling a bytearray from the right
+    # and decoding: per-byte stores cost more bytecode than the join saves.
+    # Sizing the output up front from bit_length() doesn't pay either; the
+    # loop's own compare is the only digit count needed
+    parts = []
+    append = parts.append
+    
+    while url_id >= _B62_BASE2:
+        url_id, r = divmod(url_id, _B62_BASE2)
+        append(_B62_PAIRS[r])
+    
+    # Remaining 1-2 leading digits (no zero padding)
+    append(_B62_PAIRS[url_id] if url_id >= 62 else _B62_ALPHABET[url_id])
+    
+    parts.reverse()
+    return ''.join(parts)
+
+
+# bytes.translate table: ASCII char -> digit value, 0xFF for invalid chars
+_B62_DECODE_TBL = bytearray(b'\xff' * 256)
+for _i, _c in enumerate(_B62_ALPHABET):
+    _B62_DECODE_TBL[ord(_c)] = _i
+_B62_DECODE_TBL = bytes(_B62_DECODE_TBL)
+del _i, _c
+
+
+def _b62_decode(short_code: str) -> Optional[int]:
+    """Decode base-62 to number, None if the code has invalid chars"""
+    # Map every char to its digit value in one C-level pass, then validate
+    try:
+        digits = short_code.encode('ascii').translate(_B62_DECODE_TBL)
+    except UnicodeEncodeError:
+        return None
+    if 0xFF in digits:
+        return None
+    
+    result = 0
+    for value in digits:
+        result = result * 62 + value
+    
+    return result
+
+
 class Base62Strategy(EncodingStrategy):
     """Base62 encoding strategy"""
     
-    ALPHABET = string.ascii_letters + string.digits  # 62 characters
+    __slots__ = ()
     
-    def encode(self, url_id: int) -> str:
-        """Encode number to base-62"""
-        if url_id == 0:
-            return self.ALPHABET[0]
-        
-        result = []
-        base = len(self.ALPHABET)
-        
-        while url_id > 0:
-            result.append(self.ALPHABET[url_id % base])
-            url_id //= base
-        
-        return ''.join(reversed(result))
+    ALPHABET = _B62_ALPHABET
     
-    def decode(self, short_code: str) -> Optional[int]:
-        """Decode base-62 to number"""
-        base = len(self.ALPHABET)
-        result = 0
-        
-        for char in short_code:
-            if char not in self.ALPHABET:
-                return None
-            result = result * base + self.ALPHABET.index(char)
-        
-        return result
+    # Bound directly so strategy calls skip a wrapper frame
+    encode = staticmethod(_b62_encode)
+    decode = staticmethod(_b62_decode)
 
 
 class HashStrategy(EncodingStrategy):
     """Hash-based encoding strategy"""
     
+    __slots__ = ('length', '_digest_bytes')
+    
     def __init__(self, length: int = 6):
         self.length = length
+        # Only ask BLAKE2b for as many bytes as the hex code needs
+        self._digest_bytes = (length + 1) // 2
     
     def encode(self, url_id: int) -> str:
         """Generate hash-based short code"""
-        # Use URL ID as seed for hash
-        hash_obj = hashlib.md5(str(url_id).encode())
-        hash_hex = hash_obj.hexdigest()
+        # Hash the raw ID bytes; skips the str()/encode() round-trip
+        hash_obj = hashlib.blake2b(url_id.to_bytes(8, 'little'),
+                                   digest_size=self._digest_bytes)
         
         # Take first N characters
-        return hash_hex[:self.length]
+        return hash_obj.hexdigest()[:self.length]
     
     def decode(self, short_code: str) -> Optional[int]:
         """Hash is one-way, cannot decode"""
@@ -99,126 +144,317 @@ class HashStrategy(EncodingStrategy):
 
 
 class RandomStrategy(EncodingStrategy):
-    """Random string strategy"""
+    """Random-looking codes from a keyed permutation of the URL ID
     
-    def __init__(self, length: int = 6):
+    A small Feistel network scrambles url_id within [0, 62**length), so each
+    id maps to a unique fixed-length code in one shot: no retry on collision
+    and no table of issued codes. Decoding runs the rounds backwards.
+    Pass a fixed key to keep codes stable across restarts. The default
+    length of 11 is the shortest that holds every 63-bit Snowflake id.
+    """
+    
+    __slots__ = ('length', 'key', '_space', '_half_bits', '_half_mask', '_half_bytes')
+    
+    ROUNDS = 4
+    
+    def __init__(self, length: int = 11, key: Optional[bytes] = None):
         self.length = length
-        self.characters = string.ascii_letters + string.digits
-        self.generated: Dict[str, int] = {}
+        self.key = key if key is not None else os.urandom(16)
+        self._space = 62 ** length
+        # Balanced Feistel over the smallest even bit width covering the space
+        self._half_bits = ((self._space - 1).bit_length() + 1) // 2
+        self._half_mask = (1 << self._half_bits) - 1
+        self._half_bytes = (self._half_bits + 7) // 8
+    
+    def _f(self, round_idx: int, half: int) -> int:
+        """Keyed round function"""
+        digest = hashlib.blake2b(bytes((round_idx,)) + half.to_bytes(self._half_bytes, 'little'),
+                                 digest_size=self._half_bytes, key=self.key).digest()
+        return int.from_bytes(digest, 'little') & self._half_mask
+    
+    def _permute(self, x: int) -> int:
+        left, right = x >> self._half_bits, x & self._half_mask
+        for i in range(self.ROUNDS):
+            left, right = right, left ^ self._f(i, right)
+        return (left << self._half_bits) | right
+    
+    def _unpermute(self, y: int) -> int:
+        left, right = y >> self._half_bits, y & self._half_mask
+        for i in reversed(range(self.ROUNDS)):
+            left, right = right ^ self._f(i, left), left
+        return (left << self._half_bits) | right
     
     def encode(self, url_id: int) -> str:
-        """Generate random code"""
-        while True:
-            code = ''.join(random.choices(self.characters, k=self.length))
-            if code not in self.generated:
-                self.generated[code] = url_id
-                return code
+        """Generate random-looking code"""
+        if not 0 <= url_id < self._space:
+            raise ValueError(f"url_id {url_id} does not fit in {self.length} base-62 chars")
+        
+        # Cycle-walk: the Feistel domain is a power of two, re-apply until in range
+        code_id = self._permute(url_id)
+        while code_id >= self._space:
+            code_id = self._permute(code_id)
+        
+        return _b62_encode(code_id).rjust(self.length, _B62_ALPHABET[0])
     
     def decode(self, short_code: str) -> Optional[int]:
-        """Decode using lookup table"""
-        return self.generated.get(short_code)
+        """Invert the permutation"""
+        if len(short_code) != self.length:
+            return None
+        code_id = _b62_decode(short_code)
+        if code_id is None:
+            return None
+        
+        url_id = self._unpermute(code_id)
+        while url_id >= self._space:
+            url_id = self._unpermute(url_id)
+        
+        return url_id
 
 
-class URLShortener:
-    """URL shortener service"""
+class SnowflakeGenerator:
+    """64-bit time-ordered IDs: (timestamp_ms << 22) | (worker_id << 12) | seq
+    
+    Each worker mints up to 4096 ids per millisecond without coordinating
+    with other workers, so ID generation shards across processes.
+    """
+    
+    EPOCH_MS = 1704067200000  # 2024-01-01T00:00:00Z, keeps ids (and codes) short
+    WORKER_BITS = 10
+    SEQ_BITS = 12
+    MAX_SEQ = (1 << SEQ_BITS) - 1
+    MAX_ID = (1 << 63) - 1
     
-    _instance = None
+    def __init__(self, worker_id: int = 0):
+        self.worker_id = worker_id & ((1 << self.WORKER_BITS) - 1)
+        self.seq = 0
+        self.last_ms = -1
+        self._lock = threading.Lock()
+        self._worker_part = self.worker_id << self.SEQ_BITS
     
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super(URLShortener, cls).__new__(cls)
-            cls._instance._initialized = False
-        return cls._instance
+    def _now_ms(self) -> int:
+        return time.time_ns() // 1_000_000 - self.EPOCH_MS
+    
+    def _next_locked(self) -> int:
+        t = self._now_ms()
+        # Clock moved backwards: stay on the last timestamp so ids never repeat
+        if t <= self.last_ms:
+            t = self.last_ms
+            self.seq = (self.seq + 1) & self.MAX_SEQ
+            if self.seq == 0:
+                # Sequence exhausted for this millisecond; wait for the next
+                while t <= self.last_ms:
+                    t = self._now_ms()
+        else:
+            self.seq = 0
+        self.last_ms = t
+        return (t << (self.WORKER_BITS + self.SEQ_BITS)) | self._worker_part | self.seq
+    
+    def next_id(self) -> int:
+        with self._lock:
+            return self._next_locked()
+    
+    def next_ids(self, n: int) -> list:
+        """Reserve n ids under a single lock acquisition"""
+        with self._lock:
+            return [self._next_locked() for _ in range(n)]
+
+
+# Hit counters are split into per-thread shards and summed on read, so
+# concurrent expands mostly bump different slots instead of racing on one int
+_HIT_SHARDS = min(os.cpu_count() or 1, 16)
+_shard_seq = itertools.count()
+
+
+class _HitShard(threading.local):
+    """Per-thread counter slot, assigned round-robin on the thread's first access"""
     
     def __init__(self):
-        if self._initialized:
-            return
-        
-        self.urls: Dict[str, str] = {}  # short_code -> long_url
-        self.url_to_code: Dict[str, str] = {}  # long_url -> short_code
-        self.url_ids: Dict[str, int] = {}  # short_code -> url_id
-        self.next_id = 1
+        self.idx = next(_shard_seq) % _HIT_SHARDS
+
+
+_hit_shard = _HitShard()
+
+
+# The URL tables are split into shards, each with its own lock, so writers
+# on different shards don't serialize and each rehash only copies 1/16th
+_NUM_SHARDS = 16
+_SHARD_MASK = _NUM_SHARDS - 1
+
+
+def _shard(key) -> int:
+    """Shard index for a short code or URL key"""
+    return hash(key) & _SHARD_MASK
+
+
+class _URLShortener:
+    """URL shortener service (use get_shortener() for the shared instance)"""
+    
+    __slots__ = ('entries', 'url_to_code', '_entry_locks', '_url_locks', 'id_generator',
+                 'encoding_strategy', 'cache', 'cache_size')
+    
+    def __init__(self):
+        # short_code -> [long_url, url_id, hit_shards]; one record, one probe per request
+        self.entries: List[Dict[str, list]] = [{} for _ in range(_NUM_SHARDS)]
+        # long_url -> short_code
+        self.url_to_code: List[Dict[str, str]] = [{} for _ in range(_NUM_SHARDS)]
+        self._entry_locks = [threading.Lock() for _ in range(_NUM_SHARDS)]
+        self._url_locks = [threading.Lock() for _ in range(_NUM_SHARDS)]
+        self.id_generator = SnowflakeGenerator(worker_id=0)
         self.encoding_strategy: EncodingStrategy = Base62Strategy()
-        self.cache: OrderedDict = OrderedDict()  # LRU cache
+        self.cache: Dict[str, list] = {}  # LRU of entries (dicts keep insertion order)
         self.cache_size = 100
-        self.analytics: Dict[str, int] = {}  # short_code -> hit count
-        self._initialized = True
     
     def set_encoding_strategy(self, strategy: EncodingStrategy):
         """Set encoding strategy"""
+        # Fixed-length codes must cover every id the generator can mint
+        if isinstance(strategy, RandomStrategy) and strategy._space <= SnowflakeGenerator.MAX_ID:
+            raise ValueError(f"RandomStrategy length {strategy.length} is too short for "
+                             f"Snowflake ids; use length >= 11")
         self.encoding_strategy = strategy
     
     def shorten(self, long_url: str) -> str:
         """Shorten URL"""
-        # Check if already shortened
-        if long_url in self.url_to_code:
-            return self.url_to_code[long_url]
+        ui = _shard(long_url)
+        
+        # Lock order is always URL shard, then entry shard
+        with self._url_locks[ui]:
+            # Check if already shortened
+            existing = self.url_to_code[ui].get(long_url)
+            if existing is not None:
+                return existing
+            
+            # Generate short code
+            url_id = self.id_generator.next_id()
+            
+            short_code = self.encoding_strategy.encode(url_id)
+            
+            # Store mappings
+            si = _shard(short_code)
+            with self._entry_locks[si]:
+                self.entries[si][short_code] = [long_url, url_id, [0] * _HIT_SHARDS]
+            self.url_to_code[ui][long_url] = short_code
+        
+        return short_code
+    
+    def shorten_many(self, urls: List[str]) -> List[str]:
+        """Shorten a batch of URLs; returns codes in input order"""
+        url_to_code = self.url_to_code
+        unique = list(dict.fromkeys(urls))
+        # Reserve ids for the URLs that look new; re-checked under the locks below
+        new_count = sum(1 for u in unique if u not in url_to_code[_shard(u)])
         
-        # Generate short code
-        url_id = self.next_id
-        self.next_id += 1
+        # One lock acquisition for the whole id block, then encode it in one map
+        url_ids = self.id_generator.next_ids(new_count)
+        codes = list(map(self.encoding_strategy.encode, url_ids))
+        fresh = iter(zip(codes, url_ids))
         
-        short_code = self.encoding_strategy.encode(url_id)
+        by_url_shard = defaultdict(list)
+        for u in unique:
+            by_url_shard[_shard(u)].append(u)
         
-        # Store mappings
-        self.urls[short_code] = long_url
-        self.url_to_code[long_url] = short_code
-        self.url_ids[short_code] = url_id
-        self.analytics[short_code] = 0
+        # Codes are collected under the locks, so a concurrent delete_url
+        # can't make the result lookup fail afterwards
+        code_for: Dict[str, str] = {}
+        for ui, shard_urls in by_url_shard.items():
+            url_map = url_to_code[ui]
+            with self._url_locks[ui]:
+                by_entry_shard = defaultdict(dict)
+                for u in shard_urls:
+                    code = url_map.get(u)
+                    if code is None:
+                        # Deleted since the count above: mint one more id
+                        code, url_id = next(fresh, (None, None))
+                        if code is None:
+                            url_id = self.id_generator.next_id()
+                            code = self.encoding_strategy.encode(url_id)
+                        by_entry_shard[_shard(code)][code] = [u, url_id, [0] * _HIT_SHARDS]
+                        url_map[u] = code
+                    code_for[u] = code
+                for si, new_entries in by_entry_shard.items():
+                    with self._entry_locks[si]:
+                        self.entries[si].update(new_entries)
         
-        return short_code
+        return [code_for[u] for u in urls]
     
     def expand(self, short_code: str) -> Optional[str]:
         """Expand short code to long URL"""
-        # Check cache first
-        if short_code in self.cache:
-            self.cache.move_to_end(short_code)
-            self.analytics[short_code] = self.analytics.get(short_code, 0) + 1
-            return self.cache[short_code]
-        
-        # Check database
-        if short_code in self.urls:
-            long_url = self.urls[short_code]
+        # Check cache first; it holds the entry itself so the hit count
+        # is bumped in place without probing self.entries again.
+        # The cache takes no lock: each dict call is atomic under the GIL,
+        # so racing threads can at worst reorder the LRU or evict one extra
+        cache = self.cache
+        entry = cache.pop(short_code, None)
+        if entry is None:
+            # Check database (a lone get needs no lock; writers lock to
+            # keep entries and url_to_code consistent with each other)
+            entry = self.entries[hash(short_code) & _SHARD_MASK].get(short_code)
+            if entry is None:
+                return None
             
             # Update cache
-            if len(self.cache) >= self.cache_size:
-                self.cache.popitem(last=False)
-            self.cache[short_code] = long_url
-            
-            # Update analytics
-            self.analytics[short_code] = self.analytics.get(short_code, 0) + 1
-            
-            return long_url
+            if len(cache) >= self.cache_size:
+                try:
+                    del cache[next(iter(cache))]
+                except (KeyError, RuntimeError, StopIteration):
+                    pass  # Another thread changed the cache mid-eviction
         
-        return None
+        # delete_url blanks the URL, so an entry read before a delete is never re-cached
+        long_url = entry[0]
+        if long_url is None:
+            return None
+        
+        # (Re-)insert at the most-recently-used end
+        cache[short_code] = entry
+        
+        # Update analytics
+        entry[2][_hit_shard.idx] += 1
+        
+        return long_url
     
     def get_analytics(self, short_code: str) -> Optional[Dict]:
         """Get analytics for short code"""
-        if short_code not in self.analytics:
+        si = _shard(short_code)
+        with self._entry_locks[si]:
+            entry = self.entries[si].get(short_code)
+        if entry is None:
             return None
         
         return {
             "short_code": short_code,
-            "long_url": self.urls.get(short_code),
-            "hit_count": self.analytics[short_code],
+            "long_url": entry[0],
+            "hit_count": sum(entry[2]),
             "created_at": "timestamp"  # Would have actual timestamp
         }
     
     def delete_url(self, short_code: str) -> bool:
         """Delete shortened URL"""
-        if short_code in self.urls:
-            long_url = self.urls[short_code]
-            del self.urls[short_code]
-            if long_url in self.url_to_code:
-                del self.url_to_code[long_url]
-            if short_code in self.url_ids:
-                del self.url_ids[short_code]
-            if short_code in self.cache:
-                del self.cache[short_code]
-            if short_code in self.analytics:
-                del self.analytics[short_code]
-            return True
-        return False
+        si = _shard(short_code)
+        with self._entry_locks[si]:
+            entry = self.entries[si].pop(short_code, None)
+        if entry is None:
+            return False
+        long_url = entry[0]
+        # Tombstone the shared record so copies still held by the cache stop resolving
+        entry[0] = None
+        ui = _shard(long_url)
+        with self._url_locks[ui]:
+            self.url_to_code[ui].pop(long_url, None)
+        self.cache.pop(short_code, None)
+        return True
+
+
+_SHORTENER: Optional[_URLShortener] = None
+_SHORTENER_LOCK = threading.Lock()
+
+
+def get_shortener() -> _URLShortener:
+    """Return the process-wide shortener, creating it on first use"""
+    global _SHORTENER
+    if _SHORTENER is None:
+        with _SHORTENER_LOCK:
+            if _SHORTENER is None:
+                _SHORTENER = _URLShortener()
+    return _SHORTENER
 
 
 # ==================== DEMONSTRATION ====================
@@ -229,7 +465,7 @@ def main():
     print("=" * 60)
     print()
     
-    shortener = URLShortener()
+    shortener = get_shortener()
     
     print("1. Shortening URLs with Base62:")
     url1 = "https://www.example.com/very/long/url/path"